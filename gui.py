@@ -1,21 +1,127 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import sys
 import threading
+import selectors
 import time
-from datetime import datetime
+import math
+import re
+import array
 from collections import deque
-import bluetooth
-import matplotlib
-matplotlib.use('TkAgg')
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
+
+# NumPy and pybluez are imported on first use so the window can
+# appear before the heavy modules are loaded
+_np = None
+
+
+def _get_np():
+    """Import NumPy on first use"""
+    global _np
+    if _np is None:
+        import numpy
+        _np = numpy
+    return _np
+
+
+# ESP32 frames look like b"DEV:1,HR:72,HR_VALID:1,SPO2:98,...,TIMESTAMP:12345"
+# or b"DEV:1,STATUS:NO_FINGER"
+_FIELD_RE = re.compile(
+    rb'(?:^|,)(HR|HR_VALID|SPO2|SPO2_VALID|IR_AVG|IR_RANGE|TIMESTAMP|STATUS):([^,\s]+)'
+)
+_FIELD_KEYS = {
+    b'HR': 'hr',
+    b'HR_VALID': 'hr_valid',
+    b'SPO2': 'spo2',
+    b'SPO2_VALID': 'spo2_valid',
+    b'IR_AVG': 'ir_avg',
+    b'IR_RANGE': 'ir_range',
+    b'TIMESTAMP': 'timestamp',
+}
+_FLAG_FIELDS = frozenset((b'HR_VALID', b'SPO2_VALID'))
+
+# The firmware always emits reading frames with the same fields in the same
+# order, so one fullmatch unpacks all seven values at once
+_READING_FRAME_RE = re.compile(
+    rb'DEV:\d+,HR:(-?\d+),HR_VALID:(\d),SPO2:(-?\d+),SPO2_VALID:(\d),'
+    rb'IR_AVG:(-?\d+),IR_RANGE:(-?\d+),TIMESTAMP:(\d+)\s*'
+)
+
+# Device status values, interned so status checks compare by identity
+_STATUS_RECEIVING = sys.intern('receiving')
+_STATUS_CONNECTED = sys.intern('connected')
+_STATUS_DISCONNECTED = sys.intern('disconnected')
+_STATUS_ERROR = sys.intern('error')
+_STATUS_NO_FINGER = sys.intern('NO_FINGER')
+
+# Physiologically plausible ranges; readings outside are not buffered
+_HR_MIN, _HR_MAX = 40, 200
+_SPO2_MIN, _SPO2_MAX = 70, 100
+
+# HR display colors: np.digitize(hr, _HR_COLOR_BINS) indexes _HR_COLORS, giving
+# red < 40 <= orange < 60 <= green <= 100 < orange <= 120 < red (integer HR)
+_HR_COLOR_BINS = (40, 60, 101, 121)
+_HR_COLORS = ('#e74c3c', '#f39c12', '#50c878', '#f39c12', '#e74c3c')
+
+# Fixed HR axis of the trend graph
+_PLOT_HR_MIN, _PLOT_HR_MAX = 40, 140
 
 
 # ============================================================================
 # ESP32 Device Management Classes
 # ============================================================================
 
+class Ring5:
+    """Five-slot circular buffer with a running sum and a sorting-network median"""
+    
+    __slots__ = ('buf', 'i', 'n', 'total')
+    
+    def __init__(self, typecode='H'):
+        self.buf = array.array(typecode, [0] * 5)
+        self.i = 0          # Next write slot
+        self.n = 0          # Number of filled slots
+        self.total = 0      # Sum of the filled slots
+    
+    def __len__(self):
+        return self.n
+    
+    def push(self, x):
+        """Store a value, overwriting the oldest once all five slots are filled"""
+        buf = self.buf
+        i = self.i
+        if self.n == 5:
+            self.total -= buf[i]
+        else:
+            self.n += 1
+        buf[i] = x
+        self.total += x
+        self.i = (i + 1) % 5
+    
+    def last(self):
+        """Most recently pushed value"""
+        return self.buf[self.i - 1]
+    
+    def sorted_median(self):
+        """Median of the filled slots"""
+        n = self.n
+        if n < 5:
+            window = sorted(self.buf[:n])
+            mid = n // 2
+            return window[mid] if n % 2 else (window[mid - 1] + window[mid]) / 2
+        
+        # Unrolled 9-comparator sorting network for five values
+        a, b, c, d, e = self.buf
+        if a > b: a, b = b, a
+        if d > e: d, e = e, d
+        if c > e: c, e = e, c
+        if c > d: c, d = d, c
+        if a > d: a, d = d, a
+        if a > c: a, c = c, a
+        if b > e: b, e = e, b
+        if b > d: b, d = d, b
+        if b > c: b, c = c, b
+        return c
+
+
 class ESP32Device:
     """Represents a single ESP32 heart rate monitor device"""
     
@@ -24,7 +130,19 @@ class ESP32Device:
         self.name = name
         self.mac_address = mac_address
         self.sock = None
-        self.connected = False
+        self._rx_buffer = bytearray()
+        
+        # Live view handed to the GUI by MultiDeviceManager.get_all_data; the
+        # connected/smoothed_* properties below read and write it in place
+        self.info = {
+            'name': name,
+            'connected': False,
+            'smoothed_hr': None,
+            'smoothed_spo2': None
+        }
+        
+        # Guards the buffers below, written by the receive thread and read by the GUI
+        self._lock = threading.Lock()
         
         # Data storage
         self.latest_data = {
@@ -35,19 +153,37 @@ class ESP32Device:
             'ir_avg': None,
             'ir_range': None,
             'timestamp': None,
-            'local_time': None,
-            'status': 'disconnected'
+            'local_time_epoch': None,  # Wall-clock time of receipt; convert only for display
+            'status': _STATUS_DISCONNECTED
         }
         
+        # Frames are stamped once with time.monotonic(), so clock steps cannot
+        # move plot points; this offset turns a stamp into local_time_epoch and
+        # is refreshed on every connect
+        self._epoch_offset = time.time() - time.monotonic()
+        
         # Historical data for metrics calculation (store last 5 minutes = 300 readings)
-        self.hr_history = deque(maxlen=300)
-        self.timestamp_history = deque(maxlen=300)
+        # Preallocated ring buffer: _head is the next write slot, _count the fill level
+        np = _get_np()
+        self.history_size = 300
+        self.hr_ring = np.empty(self.history_size, np.int16)
+        self._head = 0
+        self._count = 0
+        
+        # Running accumulators over the HR ring, updated in O(1) per sample
+        self._hr_sum = 0
+        self._hr_sumsq = 0
+        self._rmssd_sumsq = 0
+        self._prev_hr = None
+        self._hr_dirty = False
         
         # Smoothing buffer for display (last 5 readings for moving average)
-        self.hr_smoothing_buffer = deque(maxlen=5)
-        self.spo2_smoothing_buffer = deque(maxlen=5)
-        self.smoothed_hr = None
-        self.smoothed_spo2 = None
+        self._hr_window = Ring5()
+        self._spo2_window = Ring5('B')  # SpO2 is 70-100, fits in a byte
+        
+        # Optional shared deque receiving (device_id, time.monotonic(), smoothed HR or None)
+        # for every parsed frame; set by MultiDeviceManager.add_device
+        self.inbox = None
         
         # Calculated metrics
         self.metrics = {
@@ -57,6 +193,36 @@ class ESP32Device:
             'rmssd': None,
             'avg_spo2': None
         }
+        
+        self.info['data'] = self.latest_data
+        self.info['metrics'] = self.metrics
+    
+    @property
+    def connected(self):
+        """Whether the Bluetooth link is up"""
+        return self.info['connected']
+    
+    @connected.setter
+    def connected(self, value):
+        self.info['connected'] = value
+    
+    @property
+    def smoothed_hr(self):
+        """Median-smoothed heart rate for display"""
+        return self.info['smoothed_hr']
+    
+    @smoothed_hr.setter
+    def smoothed_hr(self, value):
+        self.info['smoothed_hr'] = value
+    
+    @property
+    def smoothed_spo2(self):
+        """Mean-smoothed SpO2 for display"""
+        return self.info['smoothed_spo2']
+    
+    @smoothed_spo2.setter
+    def smoothed_spo2(self, value):
+        self.info['smoothed_spo2'] = value
     
     def connect(self):
         """Connect to the ESP32 device via Bluetooth"""
@@ -65,17 +231,19 @@ class ESP32Device:
             return False
         
         try:
+            import bluetooth
             print(f"[{self.name}] Connecting to {self.mac_address}...")
+            self._epoch_offset = time.time() - time.monotonic()
             self.sock = bluetooth.BluetoothSocket(bluetooth.RFCOMM)
             self.sock.connect((self.mac_address, 1))
             self.connected = True
-            self.latest_data['status'] = 'connected'
+            self.latest_data['status'] = _STATUS_CONNECTED
             print(f"[{self.name}] ✅ Connected successfully!")
             return True
         except Exception as e:
             print(f"[{self.name}] ❌ Connection failed: {e}")
             self.connected = False
-            self.latest_data['status'] = 'error'
+            self.latest_data['status'] = _STATUS_ERROR
             return False
     
     def disconnect(self):
@@ -87,130 +255,199 @@ class ESP32Device:
             except:
                 pass
         self.connected = False
-        self.latest_data['status'] = 'disconnected'
+        self.latest_data['status'] = _STATUS_DISCONNECTED
     
-    def parse_data(self, data_string):
-        """Parse incoming data from ESP32"""
+    def parse_data(self, line):
+        """Parse one incoming line (bytes) from ESP32"""
         try:
-            parts = data_string.strip().split(',')
-            data_dict = {}
-            
-            for part in parts:
-                if ':' in part:
-                    key, value = part.split(':', 1)
-                    data_dict[key] = value
-            
-            # Update latest data
-            if 'HR' in data_dict:
-                self.latest_data['hr'] = int(data_dict['HR'])
-            if 'HR_VALID' in data_dict:
-                self.latest_data['hr_valid'] = bool(int(data_dict['HR_VALID']))
-            if 'SPO2' in data_dict:
-                self.latest_data['spo2'] = int(data_dict['SPO2'])
-            if 'SPO2_VALID' in data_dict:
-                self.latest_data['spo2_valid'] = bool(int(data_dict['SPO2_VALID']))
-            if 'IR_AVG' in data_dict:
-                self.latest_data['ir_avg'] = int(data_dict['IR_AVG'])
-            if 'IR_RANGE' in data_dict:
-                self.latest_data['ir_range'] = int(data_dict['IR_RANGE'])
-            if 'TIMESTAMP' in data_dict:
-                self.latest_data['timestamp'] = int(data_dict['TIMESTAMP'])
-            
-            self.latest_data['local_time'] = datetime.now()
+            latest_data = self.latest_data
+            status = _STATUS_RECEIVING
             
-            # Check for status messages
-            if 'STATUS' in data_dict:
-                self.latest_data['status'] = data_dict['STATUS']
+            frame = _READING_FRAME_RE.fullmatch(line)
+            if frame is not None:
+                # Fast path: a regular reading frame in firmware field order
+                hr, hr_valid, spo2, spo2_valid, ir_avg, ir_range, timestamp = frame.groups()
+                hr = int(hr)
+                hr_valid = hr_valid != b'0'
+                spo2 = int(spo2)
+                spo2_valid = spo2_valid != b'0'
+                latest_data['hr'] = hr
+                latest_data['hr_valid'] = hr_valid
+                latest_data['spo2'] = spo2
+                latest_data['spo2_valid'] = spo2_valid
+                latest_data['ir_avg'] = int(ir_avg)
+                latest_data['ir_range'] = int(ir_range)
+                latest_data['timestamp'] = int(timestamp)
+                has_hr = has_spo2 = True
             else:
-                self.latest_data['status'] = 'receiving'
+                # Status messages and anything else: match fields by name
+                has_hr = has_spo2 = False
+                for key, value in _FIELD_RE.findall(line):
+                    if key == b'STATUS':
+                        status = sys.intern(value.decode('utf-8', errors='ignore'))
+                    elif key in _FLAG_FIELDS:
+                        latest_data[_FIELD_KEYS[key]] = bool(int(value))
+                    else:
+                        latest_data[_FIELD_KEYS[key]] = int(value)
+                        if key == b'HR':
+                            has_hr = True
+                        elif key == b'SPO2':
+                            has_spo2 = True
+                hr = latest_data['hr']
+                hr_valid = latest_data['hr_valid']
+                spo2 = latest_data['spo2']
+                spo2_valid = latest_data['spo2_valid']
             
-            # Add to history if heart rate is valid
-            if self.latest_data['hr_valid'] and self.latest_data['hr'] is not None:
-                if 40 <= self.latest_data['hr'] <= 200:
-                    self.hr_history.append(self.latest_data['hr'])
-                    self.timestamp_history.append(time.time())
-                    self.hr_smoothing_buffer.append(self.latest_data['hr'])
+            now = time.monotonic()
+            latest_data['local_time_epoch'] = now + self._epoch_offset
             
-            # Add SpO2 to smoothing buffer if valid
-            if self.latest_data['spo2_valid'] and self.latest_data['spo2'] is not None:
-                if 70 <= self.latest_data['spo2'] <= 100:
-                    self.spo2_smoothing_buffer.append(self.latest_data['spo2'])
+            # STATUS is only present in status messages (e.g. NO_FINGER)
+            latest_data['status'] = status
             
-            # Calculate smoothed values
-            self.calculate_smoothed_values()
+            # Smoothed values and metrics are recomputed by the GUI tick
+            # (see recompute_metrics), so only the buffers are updated here;
+            # the plot gets this sample's median of 5 through the inbox.
+            # Only readings carried by this frame are buffered, so status
+            # messages never re-append a stale value.
+            with self._lock:
+                if has_hr and hr_valid and _HR_MIN <= hr <= _HR_MAX:
+                    smoothed_hr = self._update_hr(hr)
+                else:
+                    smoothed_hr = None
+                
+                if has_spo2 and spo2_valid and _SPO2_MIN <= spo2 <= _SPO2_MAX:
+                    self._spo2_window.push(spo2)
             
-            # Calculate metrics
-            self.calculate_metrics()
+            # Frames without an accepted HR still notify the GUI, since SpO2
+            # and status changes need a refresh too
+            if self.inbox is not None:
+                self.inbox.append((self.device_id, now, smoothed_hr))
             
             return True
         except Exception as e:
             print(f"[{self.name}] Parse error: {e}")
             return False
     
+    def _update_hr(self, hr):
+        """Append a validated HR sample to the history and smoothing window; return the new median"""
+        head = self._head
+        size = self.history_size
+        
+        if self._count == size:
+            # When full, the write slot holds the oldest sample; convert to
+            # Python ints so squaring cannot overflow int16
+            oldest = int(self.hr_ring[head])
+            second_oldest = int(self.hr_ring[(head + 1) % size])
+            self._hr_sum -= oldest
+            self._hr_sumsq -= oldest * oldest
+            self._rmssd_sumsq -= (second_oldest - oldest) ** 2
+        else:
+            self._count += 1
+        
+        if self._prev_hr is not None:
+            self._rmssd_sumsq += (hr - self._prev_hr) ** 2
+        self._hr_sum += hr
+        self._hr_sumsq += hr * hr
+        self._prev_hr = hr
+        self._hr_dirty = True
+        
+        self.hr_ring[head] = hr
+        self._head = (head + 1) % size
+        self._hr_window.push(hr)
+        return self._hr_window.sorted_median()
+    
+    def recompute_metrics(self):
+        """Refresh smoothed values and metrics from the buffers filled by parse_data"""
+        with self._lock:
+            self.calculate_smoothed_values()
+            self.calculate_metrics()
+    
     def calculate_smoothed_values(self):
         """Calculate smoothed values using moving average filter"""
         # Smooth heart rate - use median of last 5 readings (better outlier rejection)
-        if len(self.hr_smoothing_buffer) >= 3:
-            self.smoothed_hr = int(np.median(list(self.hr_smoothing_buffer)))
-        elif len(self.hr_smoothing_buffer) > 0:
-            self.smoothed_hr = int(np.mean(list(self.hr_smoothing_buffer)))
+        if len(self._hr_window) > 0:
+            self.smoothed_hr = int(self._hr_window.sorted_median())
         
         # Smooth SpO2 - use average of last 5 readings
-        if len(self.spo2_smoothing_buffer) >= 3:
-            self.smoothed_spo2 = int(np.mean(list(self.spo2_smoothing_buffer)))
-        elif len(self.spo2_smoothing_buffer) > 0:
-            self.smoothed_spo2 = int(list(self.spo2_smoothing_buffer)[-1])
+        count = len(self._spo2_window)
+        if count >= 3:
+            self.smoothed_spo2 = self._spo2_window.total // count
+        elif count > 0:
+            self.smoothed_spo2 = self._spo2_window.last()
     
     def calculate_metrics(self):
         """Calculate health metrics from historical data"""
-        if len(self.hr_history) < 2:
+        n = self._count
+        if n < 2:
             return
         
-        hr_array = np.array(list(self.hr_history))
+        # Average SpO2 if valid
+        if self.latest_data['spo2_valid'] and self.latest_data['spo2'] is not None:
+            self.metrics['avg_spo2'] = self.latest_data['spo2']
+        
+        # HR metrics only change when a valid sample has been appended
+        if not self._hr_dirty:
+            return
+        self._hr_dirty = False
+        
+        hr_sum = self._hr_sum
         
         # BPM - Average heart rate
-        self.metrics['bpm'] = np.mean(hr_array)
+        bpm = hr_sum / n
+        self.metrics['bpm'] = bpm
         
         # IPM - Impulses Per Minute
-        self.metrics['ipm'] = self.metrics['bpm']
+        self.metrics['ipm'] = bpm
         
         # HRSTD - Heart Rate Standard Deviation
-        self.metrics['hrstd'] = np.std(hr_array)
+        # n^2 * variance = n * sum(x^2) - sum(x)^2 is exact in integers, so a
+        # single division and sqrt suffice and no cancellation can go negative
+        self.metrics['hrstd'] = math.sqrt((n * self._hr_sumsq - hr_sum * hr_sum) / (n * n))
         
         # RMSSD - Root Mean Square of Successive Differences
-        if len(hr_array) >= 2:
-            successive_diffs = np.diff(hr_array)
-            self.metrics['rmssd'] = np.sqrt(np.mean(successive_diffs ** 2))
-        
-        # Average SpO2 if valid
-        if self.latest_data['spo2_valid'] and self.latest_data['spo2'] is not None:
-            self.metrics['avg_spo2'] = self.latest_data['spo2']
+        self.metrics['rmssd'] = math.sqrt(self._rmssd_sumsq / (n - 1))
     
     def receive_data(self):
-        """Continuously receive data from the device"""
-        buffer = ""
+        """Read whatever the socket has ready; returns False once the link is lost"""
+        import bluetooth
+        try:
+            data = self.sock.recv(4096)
+        except bluetooth.BluetoothError as e:
+            print(f"[{self.name}] Bluetooth error: {e}")
+            self.connected = False
+            self.latest_data['status'] = _STATUS_ERROR
+            return False
+        except Exception as e:
+            # Returning True would leave the socket registered and the selector
+            # would report it again at once, so treat it as a lost link too
+            print(f"[{self.name}] Error: {e}")
+            self.connected = False
+            self.latest_data['status'] = _STATUS_ERROR
+            return False
         
-        while self.connected:
-            try:
-                data = self.sock.recv(1024)
-                if data:
-                    buffer += data.decode('utf-8', errors='ignore')
-                    
-                    # Process complete lines
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-                        if line.strip():
-                            self.parse_data(line)
-                else:
-                    time.sleep(0.1)
-            except bluetooth.BluetoothError as e:
-                print(f"[{self.name}] Bluetooth error: {e}")
-                self.connected = False
-                self.latest_data['status'] = 'error'
+        if not data:
+            # A readable socket with no data means the device hung up
+            print(f"[{self.name}] Connection closed by device")
+            self.connected = False
+            self.latest_data['status'] = _STATUS_ERROR
+            return False
+        
+        self._ingest(data)
+        return True
+    
+    def _ingest(self, data):
+        """Append received bytes and parse every complete line"""
+        buffer = self._rx_buffer
+        buffer.extend(data)
+        
+        while True:
+            newline = buffer.find(b'\n')
+            if newline < 0:
                 break
-            except Exception as e:
-                print(f"[{self.name}] Error: {e}")
-                time.sleep(1)
+            line = bytes(buffer[:newline])
+            del buffer[:newline + 1]
+            if line.strip():
+                self.parse_data(line)
 
 
 class MultiDeviceManager:
@@ -220,24 +457,46 @@ class MultiDeviceManager:
         self.devices = []
         self.threads = []
         self.running = False
+        self._selector = None
+        self._snapshot = {}
+        
+        # (device_id, time.monotonic(), smoothed HR or None) per parsed frame from all devices,
+        # drained by the GUI each tick; bounded so a stalled GUI drops the
+        # oldest frames instead of growing
+        self.inbox = deque(maxlen=512)
     
     def add_device(self, device_id, name, mac_address=None):
         """Add a device to manage"""
         device = ESP32Device(device_id, name, mac_address)
+        device.inbox = self.inbox
         self.devices.append(device)
+        self._snapshot[device_id] = device.info
         return device
     
-    def scan_devices(self):
-        """Scan for nearby Bluetooth devices"""
+    def scan_devices(self, callback=None, rounds=4):
+        """Scan for nearby Bluetooth devices, reporting each one as it is found"""
         print("\n🔍 Scanning for Bluetooth devices...")
         
+        # Several short inquiries instead of one long one, so callback(mac, name)
+        # sees the first devices after a couple of seconds. Names are looked up
+        # once per new address rather than by every inquiry round
+        nearby_devices = []
+        seen = set()
         try:
-            nearby_devices = bluetooth.discover_devices(duration=8, lookup_names=True)
-            print(f"Found {len(nearby_devices)} devices")
-            return nearby_devices
+            import bluetooth
+            for _ in range(rounds):
+                for mac in bluetooth.discover_devices(duration=2, lookup_names=False):
+                    if mac not in seen:
+                        seen.add(mac)
+                        name = bluetooth.lookup_name(mac) or "Unknown"
+                        nearby_devices.append((mac, name))
+                        if callback:
+                            callback(mac, name)
         except Exception as e:
             print(f"❌ Scan failed: {e}")
-            return []
+        
+        print(f"Found {len(nearby_devices)} devices")
+        return nearby_devices
     
     def connect_all(self):
         """Connect to all devices"""
@@ -250,11 +509,33 @@ class MultiDeviceManager:
         """Start receiving data from all connected devices"""
         self.running = True
         
+        # One selector thread serves every device instead of a thread per socket
+        self._selector = selectors.DefaultSelector()
         for device in self.devices:
             if device.connected:
-                thread = threading.Thread(target=device.receive_data, daemon=True)
-                thread.start()
-                self.threads.append(thread)
+                self._selector.register(device.sock.fileno(), selectors.EVENT_READ, device)
+        
+        thread = threading.Thread(target=self._receive_loop, daemon=True)
+        thread.start()
+        self.threads.append(thread)
+    
+    def _receive_loop(self):
+        """Wait for any device socket to become readable and hand it the data"""
+        selector = self._selector
+        
+        while self.running and selector.get_map():
+            try:
+                events = selector.select(timeout=0.1)
+            except (OSError, ValueError):
+                # Sockets were closed underneath us by stop()
+                break
+            
+            for key, _ in events:
+                device = key.data
+                if not device.receive_data():
+                    selector.unregister(key.fd)
+        
+        selector.close()
     
     def stop(self):
         """Stop all devices and threads"""
@@ -263,15 +544,8 @@ class MultiDeviceManager:
             device.disconnect()
     
     def get_all_data(self):
-        """Get data from all devices"""
-        return {device.device_id: {
-            'name': device.name,
-            'data': device.latest_data,
-            'metrics': device.metrics,
-            'connected': device.connected,
-            'smoothed_hr': device.smoothed_hr,
-            'smoothed_spo2': device.smoothed_spo2
-        } for device in self.devices}
+        """Get data from all devices (live dicts, updated in place by each device)"""
+        return self._snapshot
 
 
 # ============================================================================
@@ -294,19 +568,26 @@ class CompactHeartRateGUI:
         # Store scanned devices
         self.scanned_devices = []
         
-        # Data for plotting
-        self.plot_data = {
-            1: {'time': [], 'hr': []},
-            2: {'time': [], 'hr': []},
-            3: {'time': [], 'hr': []}
-        }
+        # Data for plotting: one ring buffer row per device, allocated on connect
+        # (see _reset_plot_buffers)
         self.max_plot_points = 60  # Show last 60 seconds
+        self._t0 = time.monotonic()  # Plot times are seconds since this point
+        self._buf_time = None
+        self._buf_hr = None
+        self._plot_head = [0, 0, 0]
+        self._plot_count = [0, 0, 0]
+        
+        # Update timer - the graph repaints only on some ticks, and only while
+        # it holds points (their x position ages with the clock)
+        self.target_fps = 2.0       # Label refresh rate (Hz)
+        self.target_plot_fps = 0.5  # Graph repaint rate (Hz)
+        self._tick = 0
+        self._tick_times = deque(maxlen=20)  # Recent update_display durations (s)
+        self._was_viewable = False  # Set on the first tick after the window is mapped
         
         # Setup UI
         self.setup_ui()
         
-        # Update timer
-        self.update_interval = 500  # ms
         self.update_display()
     
     def setup_ui(self):
@@ -431,6 +712,27 @@ class CompactHeartRateGUI:
         results_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         results_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Scan result widgets are created once and reused (see _append_scan_result)
+        self._scan_header = tk.Label(
+            self.scan_results_frame,
+            text="Found Devices (click to copy MAC):",
+            font=('Arial', 9, 'bold'),
+            bg='#2d2d2d',
+            fg='#ffffff'
+        )
+        self._scan_btns = [
+            tk.Button(
+                self.scan_results_frame,
+                font=('Arial', 8),
+                bg='#3d3d3d',
+                fg='#ffffff',
+                relief=tk.RAISED,
+                borderwidth=1,
+                command=lambda i=i: self._on_scan_pick(i)
+            )
+            for i in range(6)  # Show max 6 devices
+        ]
+        
         # Control buttons - always visible at bottom
         btn_frame = tk.Frame(config_panel, bg='#2d2d2d')
         btn_frame.pack(pady=3)
@@ -497,17 +799,69 @@ class CompactHeartRateGUI:
             fg='#ffffff'
         ).pack(pady=5)
         
-        # Create matplotlib figure - larger for dedicated graph tab
-        self.fig = Figure(figsize=(7.5, 3.5), dpi=100, facecolor='#2d2d2d')
-        self.ax = self.fig.add_subplot(111)
-        self.ax.set_facecolor('#1e1e1e')
-        self.ax.set_xlabel('Seconds Ago', color='white', fontsize=10)
-        self.ax.set_ylabel('Heart Rate (bpm)', color='white', fontsize=10)
-        self.ax.tick_params(colors='white', labelsize=9)
-        self.ax.grid(True, alpha=0.3)
+        # Lines are plain canvas items; each frame only moves their points
+        self._plot_canvas = tk.Canvas(graph_frame, bg='#1e1e1e', highlightthickness=0)
+        self._plot_canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        self.canvas = FigureCanvasTkAgg(self.fig, master=graph_frame)
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        colors = ['#e74c3c', '#50c878', '#4a90e2']
+        self._line_ids = [
+            self._plot_canvas.create_line(0, 0, 0, 0, fill=color, width=2, state=tk.HIDDEN)
+            for color in colors
+        ]
+        # Plain lines; only the newest sample of each device gets a dot
+        self._head_ids = [
+            self._plot_canvas.create_oval(0, 0, 0, 0, fill=color, outline=color, state=tk.HIDDEN)
+            for color in colors
+        ]
+        self._plot_colors = colors
+        self._plot_area = None
+        
+        # Axes depend on the canvas size, so they are redrawn when it changes
+        self._plot_canvas.bind("<Configure>", self._draw_plot_axes)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+    
+    def _on_tab_changed(self, event):
+        """Bring the graph up to date as soon as its tab is shown"""
+        if self.notebook.index('current') == 2:
+            self.update_plot()
+    
+    def _draw_plot_axes(self, event):
+        """Draw the static grid, tick labels and device legend for the current size"""
+        canvas = self._plot_canvas
+        canvas.delete('axes')
+        
+        # Plot area in pixels, leaving room for the tick labels and axis titles
+        x0, y0 = 55, 10
+        x1, y1 = event.width - 10, event.height - 35
+        if x1 <= x0 or y1 <= y0:
+            return
+        self._plot_area = (x0, y0, x1, y1)
+        
+        for hr in range(_PLOT_HR_MIN, _PLOT_HR_MAX + 1, 20):
+            y = y1 - (hr - _PLOT_HR_MIN) * (y1 - y0) / (_PLOT_HR_MAX - _PLOT_HR_MIN)
+            canvas.create_line(x0, y, x1, y, fill='#4d4d4d', dash=(4, 4), tags='axes')
+            canvas.create_text(x0 - 5, y, text=str(hr), anchor=tk.E, fill='white',
+                               font=('Arial', 7), tags='axes')
+        
+        for ago in range(0, self.max_plot_points + 1, 10):
+            x = x1 - ago * (x1 - x0) / self.max_plot_points
+            canvas.create_line(x, y0, x, y1, fill='#4d4d4d', dash=(4, 4), tags='axes')
+            canvas.create_text(x, y1 + 5, text=str(ago), anchor=tk.N, fill='white',
+                               font=('Arial', 7), tags='axes')
+        
+        canvas.create_rectangle(x0, y0, x1, y1, outline='#808080', tags='axes')
+        canvas.create_text((x0 + x1) / 2, event.height - 2, text='Seconds Ago',
+                           anchor=tk.S, fill='white', font=('Arial', 8), tags='axes')
+        canvas.create_text(2, (y0 + y1) / 2, text='HR (bpm)', angle=90,
+                           anchor=tk.N, fill='white', font=('Arial', 8), tags='axes')
+        
+        for i, color in enumerate(self._plot_colors):
+            canvas.create_text(x1 - 5, y0 + 8 + 14 * i, text=f"Device {i + 1}",
+                               anchor=tk.NE, fill=color, font=('Arial', 7), tags='axes')
+        
+        # Keep the lines above the grid and rescale them to the new area
+        canvas.tag_lower('axes')
+        self.update_plot()
     
     def create_compact_device_panel(self, parent, device_id):
         """Create a very compact panel for one device"""
@@ -575,12 +929,13 @@ class CompactHeartRateGUI:
         metrics_container.pack(fill=tk.X, padx=5, pady=2)
         
         metrics_labels = {}
+        metric_spec = []
         
-        for metric_name, metric_label in [
-            ('bpm', 'Avg BPM'),
-            ('ipm', 'IPM'),
-            ('hrstd', 'HRSTD'),
-            ('rmssd', 'RMSSD')
+        for metric_name, metric_label, metric_fmt in [
+            ('bpm', 'Avg BPM', '{:.1f}'),
+            ('ipm', 'IPM', '{:.1f}'),
+            ('hrstd', 'HRSTD', '{:.2f}'),
+            ('rmssd', 'RMSSD', '{:.2f}')
         ]:
             metric_frame = tk.Frame(metrics_container, bg='#2d2d2d')
             metric_frame.pack(fill=tk.X)
@@ -604,6 +959,7 @@ class CompactHeartRateGUI:
             )
             label.pack(side=tk.RIGHT)
             metrics_labels[metric_name] = label
+            metric_spec.append((metric_name, label, metric_fmt.format))
         
         # Status
         status_label = tk.Label(
@@ -615,11 +971,16 @@ class CompactHeartRateGUI:
         )
         status_label.pack(pady=2)
         
+        # Remember what each value label shows so _set can skip no-op updates
+        for label in (hr_label, spo2_label, status_label, *metrics_labels.values()):
+            label._last = {'text': label.cget('text'), 'fg': label.cget('fg')}
+        
         # Store references
         frame.hr_label = hr_label
         frame.spo2_label = spo2_label
         frame.status_label = status_label
         frame.metrics_labels = metrics_labels
+        frame.metric_spec = metric_spec
         
         return frame
     
@@ -629,24 +990,20 @@ class CompactHeartRateGUI:
         self.scan_btn.config(state=tk.DISABLED, text="Scanning...")
         
         # Clear previous scan results
-        for widget in self.scan_results_frame.winfo_children():
-            widget.destroy()
+        self.clear_scan_results()
+        
+        def on_found(mac, name):
+            self.root.after(0, self._append_scan_result, mac, name)
         
         def scan_thread():
             try:
                 temp_manager = MultiDeviceManager()
-                devices = temp_manager.scan_devices()
+                devices = temp_manager.scan_devices(callback=on_found)
                 
                 if devices:
-                    # Store scanned devices
-                    self.scanned_devices = devices
-                    
-                    # Display results in scan results frame
-                    self.root.after(0, lambda: self.display_scan_results(devices))
-                    
+                    # Results were already shown one by one as they came in
                     self.status_label.config(text=f"✓ Found {len(devices)} device(s)", fg='#50c878')
                 else:
-                    self.scanned_devices = []
                     self.status_label.config(text="⚠️ No devices found", fg='#f39c12')
                     self.root.after(0, lambda: messagebox.showwarning("Scan Results", "No devices found"))
                 
@@ -658,37 +1015,29 @@ class CompactHeartRateGUI:
         
         threading.Thread(target=scan_thread, daemon=True).start()
     
-    def display_scan_results(self, devices):
-        """Display scanned devices in the results frame"""
-        # Clear previous results
-        for widget in self.scan_results_frame.winfo_children():
-            widget.destroy()
-        
-        if not devices:
-            return
-        
-        tk.Label(
-            self.scan_results_frame,
-            text="Found Devices (click to copy MAC):",
-            font=('Arial', 9, 'bold'),
-            bg='#2d2d2d',
-            fg='#ffffff'
-        ).pack(anchor=tk.W, pady=2)
-        
-        # Create clickable buttons for each device
-        for i, (mac, name) in enumerate(devices[:6]):  # Show max 6 devices
-            btn = tk.Button(
-                self.scan_results_frame,
-                text=f"{name}\n{mac}",
-                font=('Arial', 8),
-                bg='#3d3d3d',
-                fg='#ffffff',
-                relief=tk.RAISED,
-                borderwidth=1,
-                command=lambda m=mac, n=name: self.select_scanned_device(m, n)
-            )
+    def clear_scan_results(self):
+        """Forget previous scan results and hide the pooled result buttons"""
+        self.scanned_devices = []
+        self._scan_header.pack_forget()
+        for btn in self._scan_btns:
+            btn.pack_forget()
+    
+    def _append_scan_result(self, mac, name):
+        """Add one device found during a running scan to the result buttons"""
+        index = len(self.scanned_devices)
+        self.scanned_devices.append((mac, name))
+        if index == 0:
+            self._scan_header.pack(anchor=tk.W, pady=2)
+        if index < len(self._scan_btns):
+            btn = self._scan_btns[index]
+            btn.config(text=f"{name}\n{mac}")
             btn.pack(fill=tk.X, pady=2)
     
+    def _on_scan_pick(self, index):
+        """Handle a click on the scan result button at the given slot"""
+        mac, name = self.scanned_devices[index]
+        self.select_scanned_device(mac, name)
+    
     def select_scanned_device(self, mac, name):
         """Handle selection of a scanned device"""
         # Find first empty MAC entry or ask user
@@ -721,6 +1070,7 @@ class CompactHeartRateGUI:
         
         self.status_label.config(text="🔗 Connecting...", fg='#f39c12')
         self.connect_btn.config(state=tk.DISABLED)
+        self._reset_plot_buffers()
         
         def connect_thread():
             self.manager.connect_all()
@@ -752,130 +1102,216 @@ class CompactHeartRateGUI:
         self.connect_btn.config(state=tk.NORMAL)
         self.disconnect_btn.config(state=tk.DISABLED)
     
+    def _set(self, label, text, fg=None):
+        """Configure a value label only when its text or color actually changes"""
+        last = label._last
+        changes = {}
+        if last['text'] != text:
+            changes['text'] = text
+        if fg is not None and last['fg'] != fg:
+            changes['fg'] = fg
+        if changes:
+            label.config(**changes)
+            last.update(changes)
+    
+    def _reset_plot_buffers(self):
+        """Allocate empty plot ring buffers for all three devices"""
+        np = _get_np()
+        # One row per device; _plot_count says how many slots hold samples.
+        # Smoothed HR is a whole number of bpm, so int16 is enough to store it
+        self._buf_time = np.zeros((3, self.max_plot_points), np.float32)
+        self._buf_hr = np.zeros((3, self.max_plot_points), np.int16)
+        self._plot_head = [0, 0, 0]
+        self._plot_count = [0, 0, 0]
+    
+    def _push_batch(self, device_id, times, hrs):
+        """Append plot points for a device, overwriting the oldest when full"""
+        np = _get_np()
+        row = device_id - 1
+        size = self.max_plot_points
+        
+        # Only the newest size samples can survive; times move to the _t0 base
+        times = (np.asarray(times[-size:]) - self._t0).astype(np.float32)
+        hrs = np.asarray(hrs[-size:], np.int16)
+        count = len(times)
+        
+        # At most two slice writes: up to the end of the ring, then wrapped
+        head = self._plot_head[row]
+        first = min(count, size - head)
+        self._buf_time[row, head:head + first] = times[:first]
+        self._buf_hr[row, head:head + first] = hrs[:first]
+        rest = count - first
+        if rest:
+            self._buf_time[row, :rest] = times[first:]
+            self._buf_hr[row, :rest] = hrs[first:]
+        
+        self._plot_head[row] = (head + count) % size
+        self._plot_count[row] = min(self._plot_count[row] + count, size)
+    
+    def _plot_view(self, device_id):
+        """Return (times, hrs) for a device in chronological order, both float32"""
+        np = _get_np()
+        row = device_id - 1
+        count = self._plot_count[row]
+        times = self._buf_time[row]
+        hrs = self._buf_hr[row]
+        if count < self.max_plot_points:
+            return times[:count], hrs[:count].astype(np.float32)
+        head = self._plot_head[row]
+        return (np.concatenate((times[head:], times[:head])),
+                np.concatenate((hrs[head:], hrs[:head])).astype(np.float32))
+    
     def update_display(self):
         """Update the display with current data"""
+        tick_start = time.perf_counter()
+        
+        # While minimized or withdrawn only the plot history is kept up to date.
+        # The first ticks run before mainloop maps the window, so the check only
+        # applies once it has been shown
+        visible = self.root.winfo_viewable()
+        if visible:
+            self._was_viewable = True
+        elif not self._was_viewable:
+            visible = True
         
         if self.manager and self.running:
+            # Drain every frame received since the last tick in one pass: note
+            # which devices need a recompute and batch the smoothed HR samples
+            # for the plot
+            updated = set()
+            batches = {}
+            inbox = self.manager.inbox
+            while True:
+                try:
+                    device_id, t, hr = inbox.popleft()
+                except IndexError:
+                    break
+                updated.add(device_id)
+                if hr is None:
+                    continue
+                batch = batches.get(device_id)
+                if batch is None:
+                    batch = batches[device_id] = ([], [])
+                batch[0].append(t)
+                batch[1].append(hr)
+            
+            for device in self.manager.devices:
+                if device.device_id in updated:
+                    device.recompute_metrics()
+            
+            for device_id, (times, hrs) in batches.items():
+                self._push_batch(device_id, times, hrs)
+            
             all_data = self.manager.get_all_data()
             
-            for device_id, device_info in all_data.items():
-                if device_id in self.device_frames:
-                    frame = self.device_frames[device_id]
-                    data = device_info['data']
-                    metrics = device_info['metrics']
-                    connected = device_info['connected']
-                    smoothed_hr = device_info.get('smoothed_hr')
-                    smoothed_spo2 = device_info.get('smoothed_spo2')
-                    
-                    # Update current readings - use smoothed values for display
-                    if connected and smoothed_hr is not None:
-                        frame.hr_label.config(text=str(smoothed_hr))
-                        
-                        # Color based on HR range
-                        if 60 <= smoothed_hr <= 100:
-                            frame.hr_label.config(fg='#50c878')  # Green
-                        elif 40 <= smoothed_hr < 60 or 100 < smoothed_hr <= 120:
-                            frame.hr_label.config(fg='#f39c12')  # Orange
-                        else:
-                            frame.hr_label.config(fg='#e74c3c')  # Red
-                    elif connected and data['hr'] is not None:
-                        # Fallback to raw value if smoothed not available yet
-                        hr_text = str(data['hr']) if data['hr_valid'] else "--"
-                        frame.hr_label.config(text=hr_text)
-                    
-                    if connected and smoothed_spo2 is not None:
-                        frame.spo2_label.config(text=f"{smoothed_spo2}%")
-                    elif connected and data['spo2'] is not None:
-                        # Fallback to raw value if smoothed not available yet
-                        spo2_text = f"{data['spo2']}%" if data['spo2_valid'] else "--"
-                        frame.spo2_label.config(text=spo2_text)
-                    
-                    # Update status
-                    status = data['status']
-                    if status == 'receiving':
-                        frame.status_label.config(text="✓ Receiving", fg='#50c878')
-                    elif status == 'NO_FINGER':
-                        frame.status_label.config(text="⚠ No Finger", fg='#f39c12')
-                    elif status == 'connected':
-                        frame.status_label.config(text="Connected", fg='#4a90e2')
-                    else:
-                        frame.status_label.config(text=status, fg='#e74c3c')
-                    
-                    # Update metrics
-                    if metrics['bpm'] is not None:
-                        frame.metrics_labels['bpm'].config(text=f"{metrics['bpm']:.1f}")
-                    if metrics['ipm'] is not None:
-                        frame.metrics_labels['ipm'].config(text=f"{metrics['ipm']:.1f}")
-                    if metrics['hrstd'] is not None:
-                        frame.metrics_labels['hrstd'].config(text=f"{metrics['hrstd']:.2f}")
-                    if metrics['rmssd'] is not None:
-                        frame.metrics_labels['rmssd'].config(text=f"{metrics['rmssd']:.2f}")
-                    
-                    # Collect plot data - use smoothed values for cleaner graphs
-                    if smoothed_hr is not None:
-                        current_time = time.time()
-                        self.plot_data[device_id]['time'].append(current_time)
-                        self.plot_data[device_id]['hr'].append(smoothed_hr)
-                        
-                        # Keep only last max_plot_points
-                        if len(self.plot_data[device_id]['time']) > self.max_plot_points:
-                            self.plot_data[device_id]['time'].pop(0)
-                            self.plot_data[device_id]['hr'].pop(0)
+            # Overview labels and the graph are only refreshed while their tab
+            # is showing; plot data is still collected so history stays continuous
+            active = self.notebook.index('current') if visible else None
             
-            # Update plot
-            self.update_plot()
+            if active == 1:
+                for device_id, device_info in all_data.items():
+                    if device_id in self.device_frames:
+                        self.update_device_panel(self.device_frames[device_id], device_info)
+            
+            # Update plot - the graph repaints at target_plot_fps
+            self._tick += 1
+            plot_skip = max(1, round(self.target_fps / self.target_plot_fps))
+            # Repaint even without new samples, since the points still slide
+            # left as they age (e.g. after a finger is removed)
+            if active == 2 and self._tick % plot_skip == 0 and any(self._plot_count):
+                self.update_plot()
+        
+        if not visible:
+            self.root.after(2000, self.update_display)
+            return
+        
+        # Schedule next update, subtracting the average time a tick takes so
+        # the refresh rate stays at target_fps
+        self._tick_times.append(time.perf_counter() - tick_start)
+        busy_ms = 1000 * sum(self._tick_times) / len(self._tick_times)
+        delay_ms = max(1, int(1000 / self.target_fps - busy_ms))
+        self.root.after(delay_ms, self.update_display)
+    
+    def update_device_panel(self, frame, device_info):
+        """Refresh one device panel on the Overview tab"""
+        data = device_info['data']
+        metrics = device_info['metrics']
+        connected = device_info['connected']
+        smoothed_hr = device_info['smoothed_hr']
+        smoothed_spo2 = device_info['smoothed_spo2']
+        
+        # Update current readings - use smoothed values for display
+        if connected and smoothed_hr is not None:
+            # Color based on HR range
+            hr_color = _HR_COLORS[_get_np().digitize(smoothed_hr, _HR_COLOR_BINS)]
+            self._set(frame.hr_label, str(smoothed_hr), hr_color)
+        elif connected and data['hr'] is not None:
+            # Fallback to raw value if smoothed not available yet
+            hr_text = str(data['hr']) if data['hr_valid'] else "--"
+            self._set(frame.hr_label, hr_text)
+        
+        if connected and smoothed_spo2 is not None:
+            self._set(frame.spo2_label, f"{smoothed_spo2}%")
+        elif connected and data['spo2'] is not None:
+            # Fallback to raw value if smoothed not available yet
+            spo2_text = f"{data['spo2']}%" if data['spo2_valid'] else "--"
+            self._set(frame.spo2_label, spo2_text)
+        
+        # Update status
+        status = data['status']
+        if status == _STATUS_RECEIVING:
+            self._set(frame.status_label, "✓ Receiving", '#50c878')
+        elif status == _STATUS_NO_FINGER:
+            self._set(frame.status_label, "⚠ No Finger", '#f39c12')
+        elif status == _STATUS_CONNECTED:
+            self._set(frame.status_label, "Connected", '#4a90e2')
+        else:
+            self._set(frame.status_label, status, '#e74c3c')
         
-        # Schedule next update
-        self.root.after(self.update_interval, self.update_display)
+        # Update metrics - (key, label, formatter) built with the panel
+        for key, label, fmt in frame.metric_spec:
+            value = metrics[key]
+            if value is not None:
+                self._set(label, fmt(value))
     
     def update_plot(self):
-        """Update the heart rate plot"""
-        self.ax.clear()
+        """Update the heart rate plot by moving the canvas line points"""
+        if self._plot_area is None:
+            return  # Canvas not laid out yet
         
-        current_time = time.time()
-        colors = ['#e74c3c', '#50c878', '#4a90e2']
-        device_names = ['Device 1', 'Device 2', 'Device 3']
-        
-        has_data = False
-        for device_id in [1, 2, 3]:
-            if len(self.plot_data[device_id]['time']) > 0:
-                has_data = True
-                times = np.array(self.plot_data[device_id]['time'])
-                hrs = np.array(self.plot_data[device_id]['hr'])
-                
-                # Convert to seconds ago
-                times_ago = current_time - times
-                times_ago = times_ago[::-1]  # Reverse so most recent is at 0
-                hrs = hrs[::-1]
-                
-                self.ax.plot(times_ago, hrs, 
-                           color=colors[device_id - 1],
-                           linewidth=2,
-                           marker='o',
-                           markersize=3,
-                           label=device_names[device_id - 1],
-                           alpha=0.9)
-        
-        self.ax.set_facecolor('#1e1e1e')
-        self.ax.set_xlabel('Seconds Ago', color='white', fontsize=8)
-        self.ax.set_ylabel('HR (bpm)', color='white', fontsize=8)
-        self.ax.tick_params(colors='white', labelsize=7)
-        self.ax.grid(True, alpha=0.3, linestyle='--')
-        
-        if has_data:
-            self.ax.legend(loc='upper right', facecolor='#2d2d2d', 
-                          edgecolor='white', labelcolor='white',
-                          fontsize=7, framealpha=0.9)
-        
-        self.ax.set_xlim(self.max_plot_points, 0)
-        self.ax.set_ylim(40, 140)
-        
-        # Adjust layout to fit compact space
-        self.fig.tight_layout()
+        np = _get_np()
+        x0, y0, x1, y1 = self._plot_area
+        x_scale = (x1 - x0) / self.max_plot_points
+        y_scale = (y1 - y0) / (_PLOT_HR_MAX - _PLOT_HR_MIN)
+        now = time.monotonic() - self._t0
         
         try:
-            self.canvas.draw()
-        except:
+            for device_id, line_id, head_id in zip((1, 2, 3), self._line_ids, self._head_ids):
+                shown = 0
+                if self._plot_count[device_id - 1] > 0:
+                    times, hrs = self._plot_view(device_id)
+                    
+                    # Seconds ago runs right to left; HR is clipped to the axis range
+                    xs = x1 - (now - times) * x_scale
+                    ys = y1 - (np.clip(hrs, _PLOT_HR_MIN, _PLOT_HR_MAX) - _PLOT_HR_MIN) * y_scale
+                    keep = xs >= x0
+                    xs, ys = xs[keep], ys[keep]
+                    shown = len(xs)
+                
+                if shown > 1:
+                    pts = np.column_stack((xs, ys)).ravel().tolist()
+                    self._plot_canvas.coords(line_id, pts)
+                    self._plot_canvas.itemconfigure(line_id, state=tk.NORMAL)
+                else:
+                    self._plot_canvas.itemconfigure(line_id, state=tk.HIDDEN)
+                
+                if shown > 0:
+                    x, y = float(xs[-1]), float(ys[-1])
+                    self._plot_canvas.coords(head_id, x - 3, y - 3, x + 3, y + 3)
+                    self._plot_canvas.itemconfigure(head_id, state=tk.NORMAL)
+                else:
+                    self._plot_canvas.itemconfigure(head_id, state=tk.HIDDEN)
+        except tk.TclError:
             pass  # Ignore drawing errors during window close
     
     def on_closing(self):